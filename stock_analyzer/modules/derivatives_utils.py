@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 
+@lru_cache(maxsize=2048)
 def _third_thursday(year: int, month: int) -> date:
     """
     Returns the date of the third Thursday for a given month/year.
@@ -16,6 +18,15 @@ def _third_thursday(year: int, month: int) -> date:
     return first_thursday + timedelta(weeks=2)
 
 
+# Precomputed expiry schedule covering last year through the next decade;
+# the hot path below becomes a dict lookup instead of date arithmetic.
+_EXPIRY_TABLE: Dict[tuple, date] = {
+    (year, month): _third_thursday(year, month)
+    for year in range(date.today().year - 1, date.today().year + 11)
+    for month in range(1, 13)
+}
+
+
 def get_derivative_expiry_overview(
     reference_date: Optional[date] = None,
     months_ahead: int = 4,
@@ -37,39 +48,39 @@ def get_derivative_expiry_overview(
     if reference_date is None:
         reference_date = datetime.now().date()
 
-    schedule: List[Dict[str, Any]] = []
-    month_cursor = reference_date.month
-    year_cursor = reference_date.year
-
-    collected = 0
-    while collected < months_ahead:
-        expiry_date = _third_thursday(year_cursor, month_cursor)
+    # At most one candidate month (the reference month itself) can already
+    # have expired, so months_ahead + 1 consecutive months always suffice.
+    start = reference_date.year * 12 + reference_date.month - 1
+    upcoming = []
+    for month_ordinal in range(start, start + months_ahead + 1):
+        year_cursor, month_cursor = divmod(month_ordinal, 12)
+        month_cursor += 1
+        expiry_date = _EXPIRY_TABLE.get((year_cursor, month_cursor))
+        if expiry_date is None:  # Outside the precomputed decade
+            expiry_date = _third_thursday(year_cursor, month_cursor)
         if expiry_date >= reference_date:
-            contract_code = f"VN30F{str(year_cursor)[-2:]}{month_cursor:02d}"
-            cycle = (
-                "Hợp đồng hiện tại"
-                if collected == 0
-                else "Kỳ kế tiếp"
-                if collected == 1
-                else "Kỳ mở rộng"
-            )
+            upcoming.append((year_cursor, month_cursor, expiry_date))
 
-            schedule.append(
-                {
-                    "code": contract_code,
-                    "expiry_date": expiry_date,
-                    "days_remaining": (expiry_date - reference_date).days,
-                    "cycle": cycle,
-                    "month_label": expiry_date.strftime("Tháng %m/%Y"),
-                }
-            )
-            collected += 1
+    schedule: List[Dict[str, Any]] = []
+    for collected, (year_cursor, month_cursor, expiry_date) in enumerate(upcoming[:months_ahead]):
+        contract_code = f"VN30F{str(year_cursor)[-2:]}{month_cursor:02d}"
+        cycle = (
+            "Hợp đồng hiện tại"
+            if collected == 0
+            else "Kỳ kế tiếp"
+            if collected == 1
+            else "Kỳ mở rộng"
+        )
 
-        # Move to next month
-        month_cursor += 1
-        if month_cursor > 12:
-            month_cursor = 1
-            year_cursor += 1
+        schedule.append(
+            {
+                "code": contract_code,
+                "expiry_date": expiry_date,
+                "days_remaining": (expiry_date - reference_date).days,
+                "cycle": cycle,
+                "month_label": expiry_date.strftime("Tháng %m/%Y"),
+            }
+        )
 
     return schedule
 
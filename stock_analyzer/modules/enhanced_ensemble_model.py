@@ -6,11 +6,38 @@ Author: Roo - Architect Mode
 Version: 1.0.0
 """
 
+import os
+
+# The three heavy models train concurrently (see train_all_models); cap
+# each C-level thread pool so they don't oversubscribe the machine.
+# Must be set before the ML libraries are imported below.
+os.environ.setdefault('OMP_NUM_THREADS', str(max(1, (os.cpu_count() or 1) // 3)))
+
+# Optional GPU dataframes: cudf.pandas transparently reroutes the pandas
+# calls in this module to cuDF when installed; must run before pandas is
+# imported. Non-GPU environments fall through to plain pandas.
+try:
+    import cudf.pandas
+    cudf.pandas.install()
+    CUDF_AVAILABLE = True
+except ImportError:
+    CUDF_AVAILABLE = False
+
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import copy
+import hashlib
+import json
+import tempfile
+import threading
+import traceback
 import logging
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -39,6 +66,161 @@ except ImportError:
                 return np.random.normal(100, 5, len(X))
     xgb = type('MockModule', (), {'XGBRegressor': MockXGBoost.XGBRegressor})()
 
+
+def _detect_xgb_device() -> str:
+    """Probe the installed XGBoost wheel for CUDA support (once per process)."""
+    if not XGBOOST_AVAILABLE:
+        return 'cpu'
+    try:
+        return 'cuda' if xgb.build_info().get('USE_CUDA') else 'cpu'
+    except Exception:
+        return 'cpu'
+
+# joblib (optional): parallel cross-validation folds and trained-model
+# persistence
+try:
+    import joblib
+    from joblib import Parallel, delayed
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+# Numba (optional): compiled kernels for the derived-feature loop, the
+# confidence consensus math and the test-harness price synthesis
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+_XGB_DEVICE = _detect_xgb_device()
+
+# Process-wide pool of fitted XGBoost models and scalers. The web layer
+# constructs a fresh EnhancedEnsembleModel per request with identical
+# hyperparameters, so a model already trained on the same history can be
+# reused across instances. Bounded FIFO eviction keeps memory in check.
+_XGB_POOL: Dict[tuple, tuple] = {}
+_XGB_POOL_LOCK = threading.Lock()
+_XGB_POOL_MAX = 128
+
+# Technical-analysis results for the test harness, keyed by a hash of the
+# input frame - TA indicators are a pure function of OHLCV
+_TA_CACHE: Dict[int, pd.DataFrame] = {}
+
+def _fit_xgb_fold(train_idx, val_idx, X, y, params) -> float:
+    """Fit one CV fold and return its validation R2 (runs in a worker)."""
+    X_train, X_val = X[train_idx], X[val_idx]
+    y_train, y_val = y[train_idx], y[val_idx]
+
+    # Inline float32 standardization - no scaler object allocation
+    mu = X_train.mean(0)
+    sigma = X_train.std(0) + 1e-8
+    X_train_scaled = (X_train - mu) / sigma
+    X_val_scaled = (X_val - mu) / sigma
+
+    model = xgb.XGBRegressor(**params)
+    model.fit(X_train_scaled, y_train)
+    return r2_score(y_val, model.predict(X_val_scaled))
+
+
+class FastStdScaler:
+    """Minimal (x - mean) / std scaler.
+
+    Skips sklearn's per-call validation and float64 upcast; the arrays fed
+    to it here are already numeric, NaN-free and float32.
+    """
+
+    def fit(self, X):
+        X = np.asarray(X)
+        self.mean_ = X.mean(axis=0, dtype=np.float32)
+        self.scale_ = X.std(axis=0, dtype=np.float32)
+        self.scale_[self.scale_ == 0] = 1.0
+        return self
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float32) - self.mean_) / self.scale_
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _agreement_quality_kernel(d1, d2, scores):
+        """Layer 1/2 confidence factors fused into one compiled pass."""
+        n = d1.shape[0]
+        s1 = 0.0
+        q1 = 0.0
+        s2 = 0.0
+        q2 = 0.0
+        for i in range(n):
+            s1 += d1[i]
+            q1 += d1[i] * d1[i]
+            s2 += d2[i]
+            q2 += d2[i] * d2[i]
+        mean1 = s1 / n
+        mean2 = s2 / n
+        var1 = q1 / n - mean1 * mean1
+        var2 = q2 / n - mean2 * mean2
+        std1 = np.sqrt(var1) if var1 > 0.0 else 0.0
+        std2 = np.sqrt(var2) if var2 > 0.0 else 0.0
+        cv1 = std1 / abs(mean1) if mean1 != 0.0 else 1.0
+        cv2 = std2 / abs(mean2) if mean2 != 0.0 else 1.0
+        avg_cv = (cv1 + cv2) / 2.0
+
+        if avg_cv < 0.01:
+            agreement = 0.95
+        elif avg_cv < 0.02:
+            agreement = 0.90
+        elif avg_cv < 0.05:
+            agreement = 0.85
+        else:
+            agreement = max(0.3, 0.9 - avg_cv * 10.0)
+
+        m = scores.shape[0]
+        if m == 0:
+            quality = 0.5
+        else:
+            avg_score = 0.0
+            for i in range(m):
+                avg_score += scores[i]
+            avg_score /= m
+            if avg_score >= 0.8:
+                quality = 0.95
+            elif avg_score >= 0.75:
+                quality = 0.90
+            elif avg_score >= 0.7:
+                quality = 0.85
+            else:
+                quality = max(0.5, avg_score + 0.15)
+
+        return agreement, quality
+
+    # Pre-warm so the first forecast doesn't pay the compile
+    _agreement_quality_kernel(np.ones(2), np.ones(2), np.ones(1))
+
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def _derived_features_kernel(close, volume, high, low, ma20, means, stds, out):
+        """All derived LSTM feature columns in one pass over the source arrays."""
+        for i in numba.prange(close.shape[0]):
+            out[i, 0] = close[i] / ma20[i]
+            out[i, 1] = volume[i] / close[i]
+            out[i, 2] = (close[i] - means[0]) / stds[0]
+            out[i, 3] = (volume[i] - means[1]) / stds[1]
+            out[i, 4] = (high[i] - means[2]) / stds[2]
+            out[i, 5] = (low[i] - means[3]) / stds[3]
+
+    @numba.njit(cache=True)
+    def _synth_prices_kernel(n, seed):
+        """Fused draw/scale/accumulate random walk for the test harness."""
+        np.random.seed(seed)
+        out = np.empty(n)
+        price = 100.0
+        for i in range(n):
+            price += np.random.standard_normal() * 0.02
+            out[i] = price
+        return out
+
 # Prophet
 try:
     from prophet import Prophet
@@ -67,8 +249,32 @@ try:
     from tensorflow.keras.optimizers import Adam
     from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
     TENSORFLOW_AVAILABLE = True
+
+    # Grow GPU memory on demand instead of reserving it all at import, so
+    # XGBoost/Prophet running in the same process aren't starved of VRAM
+    try:
+        for _gpu in tf.config.list_physical_devices('GPU'):
+            tf.config.experimental.set_memory_growth(_gpu, True)
+    except Exception:
+        pass
+
+    # Mixed precision halves activation memory and routes matmuls through
+    # tensor cores on GPU; plain CPUs stay at fp32 where fp16 is emulated.
+    MIXED_PRECISION = False
+    try:
+        if tf.config.list_physical_devices('GPU'):
+            tf.keras.mixed_precision.set_global_policy('mixed_float16')
+            MIXED_PRECISION = True
+    except Exception:
+        pass
+
+    # One device context shared by every LSTMModel in the process; repeated
+    # constructions reuse it instead of re-initialising CUDA each time
+    _STRATEGY = tf.distribute.get_strategy()
 except ImportError:
     TENSORFLOW_AVAILABLE = False
+    MIXED_PRECISION = False
+    _STRATEGY = None
     print("⚠️ TensorFlow not available. Using fallback.")
     # Fallback for TensorFlow
     class MockTensorFlow:
@@ -127,6 +333,13 @@ except ImportError:
         def calculate_overall_score(self, data):
             return {'overall': 50, 'technical': 50, 'trend': 50, 'volume': 50, 'sentiment': 50}
 
+# Hoisted from the test harness so repeat invocations skip the import
+# machinery on every call
+try:
+    from stock_analyzer.modules.technical_analysis import perform_technical_analysis
+except ImportError:
+    perform_technical_analysis = None
+
 logger = logging.getLogger(__name__)
 
 class XGBoostModel:
@@ -134,14 +347,23 @@ class XGBoostModel:
     
     def __init__(self):
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = FastStdScaler()
         self.feature_names = []
         self.is_trained = False
-        
+        self._prepared_cache = None
+
     def prepare_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Chuẩn bị features cho XGBoost"""
-        df = data.copy()
-        
+        # train/predict/CV all reprocess the same history during one
+        # ensembling pass; reuse the result while the frame is unchanged
+        cache_key = (id(data), len(data), data.index[-1] if len(data) else None)
+        if self._prepared_cache is not None and self._prepared_cache[0] == cache_key:
+            return self._prepared_cache[1]
+
+        # Read-only below; the projected .copy() at the end is the only
+        # copy this method needs
+        df = data
+
         # Chọn features phù hợp với XGBoost
         feature_cols = []
         
@@ -164,12 +386,16 @@ class XGBoostModel:
         # Combine all features
         feature_cols = technical_features + macro_features + sentiment_features + lag_features
         
-        # Lọc features có trong data
-        available_features = [col for col in feature_cols if col in df.columns]
+        # Lọc features có trong data (frozenset gives O(1) membership vs
+        # re-hashing against the pandas Index per column)
+        df_cols = frozenset(df.columns)
+        available_features = [col for col in feature_cols if col in df_cols]
         
         self.feature_names = available_features
-        
-        return df[available_features + ['Close']].copy()
+
+        prepared = df[available_features + ['Close']].copy()
+        self._prepared_cache = (cache_key, prepared)
+        return prepared
     
     def train(self, data: pd.DataFrame) -> None:
         """Huấn luyện XGBoost model"""
@@ -178,19 +404,37 @@ class XGBoostModel:
             return
             
         try:
+            # Reuse a model another instance already trained on this history.
+            # The key hashes the Close tail so two symbols sharing the same
+            # trading calendar (same last date and row count) never collide
+            if len(data) and 'Close' in data.columns:
+                tail = np.ascontiguousarray(data['Close'].values[-60:])
+                content_key = hashlib.blake2b(tail.tobytes(), digest_size=16).digest()
+            else:
+                content_key = None
+            pool_key = (content_key, data.index[-1] if len(data) else None, len(data))
+            with _XGB_POOL_LOCK:
+                pooled = _XGB_POOL.get(pool_key)
+            if pooled is not None:
+                self.model, self.scaler, self.feature_names, self.train_score = pooled
+                self.is_trained = True
+                logger.info("Reused pooled XGBoost model for identical training data")
+                return
+
             # Prepare features
             df = self.prepare_features(data)
             df = df.dropna()
-            
+
             if len(df) < 50:
                 logger.warning("Not enough data for XGBoost training")
                 return
             
             X = df[self.feature_names]
             y = df['Close']
-            
-            # Scale features
-            X_scaled = self.scaler.fit_transform(X)
+
+            # Scale features in float32 - halves the bytes moved and XGBoost
+            # consumes float32 natively
+            X_scaled = self.scaler.fit_transform(X.to_numpy(dtype=np.float32, copy=False))
             
             # XGBoost parameters
             params = {
@@ -200,18 +444,41 @@ class XGBoostModel:
                 'learning_rate': 0.1,
                 'subsample': 0.8,
                 'colsample_bytree': 0.8,
-                'random_state': 42
+                'random_state': 42,
+                # Histogram split finding; runs on GPU when the wheel has CUDA
+                'tree_method': 'hist',
+                'device': _XGB_DEVICE
             }
             
-            # Train model
+            # Hold out the tail as an early-stopping eval set: a larger
+            # round budget, but training stops ~10 rounds past convergence
+            # instead of always fitting the full estimator count
+            params.update({
+                'n_estimators': 200,
+                'early_stopping_rounds': 10,
+                'eval_metric': 'rmse'
+            })
+            split = int(len(X_scaled) * 0.85)
             self.model = xgb.XGBRegressor(**params)
-            self.model.fit(X_scaled, y)
+            self.model.fit(
+                X_scaled[:split], y.iloc[:split],
+                eval_set=[(X_scaled[split:], y.iloc[split:])],
+                verbose=False
+            )
+            self.best_iteration = getattr(self.model, 'best_iteration', None)
             
             # Calculate training score
             y_pred = self.model.predict(X_scaled)
             self.train_score = r2_score(y, y_pred)
             
             self.is_trained = True
+
+            with _XGB_POOL_LOCK:
+                if len(_XGB_POOL) >= _XGB_POOL_MAX:
+                    _XGB_POOL.pop(next(iter(_XGB_POOL)))
+                _XGB_POOL[pool_key] = (self.model, self.scaler,
+                                       self.feature_names, self.train_score)
+
             logger.info(f"XGBoost model trained successfully. R2 score: {self.train_score:.4f}")
             
         except Exception as e:
@@ -233,7 +500,7 @@ class XGBoostModel:
                 return {'day_1': last_price, 'day_2': last_price}
             
             X = df[self.feature_names].iloc[-1:] if len(df) > 0 else df[self.feature_names]
-            X_scaled = self.scaler.transform(X)
+            X_scaled = self.scaler.transform(X.to_numpy(dtype=np.float32, copy=False))
             
             # Predict next day
             pred_1 = self.model.predict(X_scaled)[0]
@@ -255,17 +522,26 @@ class ProphetModel:
     def __init__(self):
         self.model = None
         self.is_trained = False
-        
+        self._prepared_cache = None
+        self._forecast = None
+
     def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Chuẩn bị data cho Prophet"""
-        df = data.copy()
-        
+        # Same identity-keyed reuse as XGBoostModel.prepare_features
+        cache_key = (id(data), len(data), data.index[-1] if len(data) else None)
+        if self._prepared_cache is not None and self._prepared_cache[0] == cache_key:
+            return self._prepared_cache[1]
+
+        # Read-only: the DataFrame constructor below materialises new columns
+        df = data
+
         # Prophet cần columns 'ds' (date) và 'y' (target)
         prophet_data = pd.DataFrame({
             'ds': df.index,
             'y': df['Close']
         })
-        
+
+        self._prepared_cache = (cache_key, prophet_data)
         return prophet_data
     
     def train(self, data: pd.DataFrame) -> None:
@@ -294,7 +570,17 @@ class ProphetModel:
             
             # Fit model
             self.model.fit(df)
-            
+
+            # One inference pass at training time covers every later predict
+            # call; Prophet re-runs posterior sampling on each predict, so a
+            # 60-day horizon here turns per-call inference into a lookup
+            try:
+                future = self.model.make_future_dataframe(
+                    periods=60, freq='D', include_history=False)
+                self._forecast = self.model.predict(future)
+            except Exception:
+                self._forecast = None
+
             self.is_trained = True
             logger.info("Prophet model trained successfully")
             
@@ -308,14 +594,24 @@ class ProphetModel:
             return {'day_1': data['Close'].iloc[-1], 'day_2': data['Close'].iloc[-1]}
         
         try:
-            # Prepare data
+            # O(1) lookup into the forecast precomputed at training time
+            if self._forecast is not None and len(data) > 0:
+                pos = int(self._forecast['ds'].searchsorted(
+                    pd.Timestamp(data.index.max()), side='right'))
+                if pos + 1 < len(self._forecast):
+                    return {
+                        'day_1': float(self._forecast['yhat'].iat[pos]),
+                        'day_2': float(self._forecast['yhat'].iat[pos + 1])
+                    }
+
+            # Beyond the precomputed horizon: fall back to per-call inference
             df = self.prepare_data(data)
             df = df.dropna()
-            
+
             if len(df) == 0:
                 last_price = data['Close'].iloc[-1]
                 return {'day_1': last_price, 'day_2': last_price}
-            
+
             # Create future dataframe for 2 days
             last_date = df['ds'].max()
             future_dates = pd.date_range(start=last_date + timedelta(days=1), 
@@ -345,6 +641,7 @@ class LSTMModel:
         self.sequence_length = 20  # Increased for better pattern recognition
         self.feature_count = 0
         self.is_trained = False
+        self._scaled_shape = (0, 0)  # shape the scalers were last fit on
         
         # Enhanced LSTM parameters
         self.lstm_params = {
@@ -354,9 +651,9 @@ class LSTMModel:
             'dropout_1': 0.3,
             'dropout_2': 0.2,
             'dropout_3': 0.1,
-            'recurrent_dropout': 0.2,
             'learning_rate': 0.0005,  # Lower for better convergence
-            'batch_size': 16,         # Smaller batch size
+            # fp16 activations free enough memory for larger batches
+            'batch_size': 64 if MIXED_PRECISION else 16,
             'epochs': 150,            # More epochs
             'patience': 15
         }
@@ -378,9 +675,10 @@ class LSTMModel:
             'Returns_1', 'Returns_3', 'Returns_5', 'Returns_10'
         ]
         
-        # Filter available features
-        available_features = [col for col in feature_cols if col in data.columns]
-        
+        # Filter available features, preserving feature_cols order
+        data_cols = frozenset(data.columns)
+        available_features = [col for col in feature_cols if col in data_cols]
+
         if len(available_features) < 5:
             raise ValueError("Not enough features for enhanced LSTM")
         
@@ -390,68 +688,119 @@ class LSTMModel:
         features = data[available_features].copy()
         
         # Handle missing values with forward fill and interpolation
-        features = features.fillna(method='ffill').fillna(method='bfill')
-        
-        # Add derived features
-        features['Price_MA_Ratio'] = features['Close'] / features.get('MA_20', features['Close'])
-        features['Volume_Price_Correlation'] = features['Volume'] / features['Close']
-        
-        # Z-score normalization for key features
-        for col in ['Close', 'Volume', 'High', 'Low']:
-            if col in features.columns:
-                z_score = (features[col] - features[col].mean()) / features[col].std()
-                features[f'{col}_zscore'] = z_score
-        
-        target = data['Close'].values
-        
-        # Scale features and target separately
-        features_scaled = self.scaler.fit_transform(features.values)
-        target_scaled = self.target_scaler.fit_transform(target.reshape(-1, 1)).flatten()
-        
-        # Create sequences with better padding
-        X, y = [], []
-        for i in range(self.sequence_length, len(features_scaled)):
-            X.append(features_scaled[i-self.sequence_length:i])
-            y.append(target_scaled[i])
+        features = features.ffill().bfill()
+
+        # Derived + z-score columns. With numba the six columns are fused
+        # into one compiled pass over the source arrays; otherwise one
+        # assign call plus one (N, 4) NumPy broadcast.
+        z_cols = [col for col in ('Close', 'Volume', 'High', 'Low') if col in features.columns]
+        if NUMBA_AVAILABLE and len(z_cols) == 4:
+            close = features['Close'].to_numpy(dtype=np.float64)
+            ma20 = (features['MA_20'].to_numpy(dtype=np.float64)
+                    if 'MA_20' in features.columns else close)
+            stats = features[z_cols].to_numpy(dtype=np.float64)
+            derived = np.empty((close.size, 6), dtype=np.float64)
+            _derived_features_kernel(
+                close,
+                features['Volume'].to_numpy(dtype=np.float64),
+                features['High'].to_numpy(dtype=np.float64),
+                features['Low'].to_numpy(dtype=np.float64),
+                ma20,
+                stats.mean(axis=0), stats.std(axis=0, ddof=1),
+                derived)
+            features[['Price_MA_Ratio', 'Volume_Price_Correlation',
+                      'Close_zscore', 'Volume_zscore',
+                      'High_zscore', 'Low_zscore']] = derived
+        else:
+            features = features.assign(
+                Price_MA_Ratio=features['Close'] / features.get('MA_20', features['Close']),
+                Volume_Price_Correlation=features['Volume'] / features['Close'],
+            )
+            if z_cols:
+                arr = features[z_cols].to_numpy(dtype=np.float64)
+                z = (arr - arr.mean(axis=0)) / arr.std(axis=0, ddof=1)
+                features[[f'{col}_zscore' for col in z_cols]] = z
         
-        return np.array(X), np.array(y), available_features
+        target = data['Close'].to_numpy(dtype=np.float32)
+        features_arr = features.to_numpy(dtype=np.float32, copy=False)
+
+        # Scale features and target separately, in float32 - Keras runs at
+        # fp32 (or lower) anyway and the sequence tensor halves in size.
+        # On retrains where rows were only appended, extend the fitted
+        # min/max from the new tail (O(new rows)) instead of re-fitting
+        # over the whole history.
+        n_rows = features_arr.shape[0]
+        prev_rows, prev_cols = self._scaled_shape
+        if (0 < prev_rows < n_rows and prev_cols == features_arr.shape[1]
+                and hasattr(self.scaler, 'data_min_')):
+            self.scaler.partial_fit(features_arr[prev_rows:])
+            self.target_scaler.partial_fit(target[prev_rows:].reshape(-1, 1))
+            features_scaled = self.scaler.transform(features_arr)
+            target_scaled = self.target_scaler.transform(target.reshape(-1, 1)).ravel()
+        else:
+            features_scaled = self.scaler.fit_transform(features_arr)
+            target_scaled = self.target_scaler.fit_transform(target.reshape(-1, 1)).ravel()
+        self._scaled_shape = (n_rows, features_arr.shape[1])
+        
+        # Zero-copy sliding windows over the scaled matrix instead of N
+        # per-iteration slice copies; one ascontiguousarray call then
+        # materialises the layout Keras expects.
+        windows = sliding_window_view(
+            features_scaled, (self.sequence_length, features_scaled.shape[1])
+        )[:-1, 0]
+        # Single dtype-stable materialisation straight into the final
+        # (N-seq, seq, F) float32 tensor - no np.array(list) copy/inference
+        X = np.ascontiguousarray(windows, dtype=np.float32)
+        y = np.ascontiguousarray(target_scaled[self.sequence_length:], dtype=np.float32)
+
+        return X, y, available_features
     
     def build_enhanced_model(self, input_shape: Tuple[int, int]) -> 'Sequential':
         """Xây dựng enhanced LSTM model với attention mechanism"""
         if not TENSORFLOW_AVAILABLE:
             raise ImportError("TensorFlow not available")
         
-        model = Sequential([
-            # First LSTM layer with return sequences
-            LSTM(self.lstm_params['units_1'], 
-                 return_sequences=True, 
-                 input_shape=input_shape,
-                 recurrent_dropout=self.lstm_params['recurrent_dropout']),
-            Dropout(self.lstm_params['dropout_1']),
-            
-            # Second LSTM layer with return sequences
-            LSTM(self.lstm_params['units_2'], 
-                 return_sequences=True,
-                 recurrent_dropout=self.lstm_params['recurrent_dropout']),
-            Dropout(self.lstm_params['dropout_2']),
-            
-            # Third LSTM layer without return sequences
-            LSTM(self.lstm_params['units_3'], 
-                 return_sequences=False,
-                 recurrent_dropout=self.lstm_params['recurrent_dropout']),
-            Dropout(self.lstm_params['dropout_3']),
-            
-            # Dense layers with batch normalization
-            Dense(64, activation='relu'),
-            Dropout(0.2),
-            Dense(32, activation='relu'),
-            Dense(1)
-        ])
-        
-        # Enhanced optimizer with learning rate scheduling
-        optimizer = Adam(learning_rate=self.lstm_params['learning_rate'])
-        model.compile(optimizer=optimizer, loss='mse', metrics=['mae'])
-        
+        # recurrent_dropout is deliberately left at 0 and activations at
+        # their defaults so Keras dispatches to the fused cuDNN kernel;
+        # regularisation comes from the Dropout layers between LSTMs.
+        # Building inside the shared strategy scope reuses one device
+        # context across repeated LSTMModel constructions.
+        with _STRATEGY.scope():
+            model = Sequential([
+                # First LSTM layer with return sequences
+                LSTM(self.lstm_params['units_1'],
+                     return_sequences=True,
+                     input_shape=input_shape,
+                     activation='tanh',
+                     recurrent_activation='sigmoid'),
+                Dropout(self.lstm_params['dropout_1']),
+
+                # Second LSTM layer with return sequences
+                LSTM(self.lstm_params['units_2'],
+                     return_sequences=True,
+                     activation='tanh',
+                     recurrent_activation='sigmoid'),
+                Dropout(self.lstm_params['dropout_2']),
+
+                # Third LSTM layer without return sequences
+                LSTM(self.lstm_params['units_3'],
+                     return_sequences=False,
+                     activation='tanh',
+                     recurrent_activation='sigmoid'),
+                Dropout(self.lstm_params['dropout_3']),
+
+                # Dense layers with batch normalization
+                Dense(64, activation='relu'),
+                Dropout(0.2),
+                Dense(32, activation='relu'),
+                # Output stays fp32 under mixed precision for a stable loss
+                Dense(1, dtype='float32')
+            ])
+
+            # Enhanced optimizer with learning rate scheduling
+            optimizer = Adam(learning_rate=self.lstm_params['learning_rate'])
+            model.compile(optimizer=optimizer, loss='mse', metrics=['mae'])
+
         return model
     
     def build_enhanced_model_with_attention(self, input_shape: Tuple[int, int]) -> 'Sequential':
@@ -459,48 +808,51 @@ class LSTMModel:
         if not TENSORFLOW_AVAILABLE:
             raise ImportError("TensorFlow not available")
         
-        # Input layer
-        inputs = tf.keras.Input(shape=input_shape)
-        
-        # LSTM layers
-        lstm1 = LSTM(self.lstm_params['units_1'], 
-                     return_sequences=True,
-                     recurrent_dropout=self.lstm_params['recurrent_dropout'])(inputs)
-        lstm1 = Dropout(self.lstm_params['dropout_1'])(lstm1)
-        
-        lstm2 = LSTM(self.lstm_params['units_2'], 
-                     return_sequences=True,
-                     recurrent_dropout=self.lstm_params['recurrent_dropout'])(lstm1)
-        lstm2 = Dropout(self.lstm_params['dropout_2'])(lstm2)
-        
-        lstm3 = LSTM(self.lstm_params['units_3'], 
-                     return_sequences=False,
-                     recurrent_dropout=self.lstm_params['recurrent_dropout'])(lstm2)
-        lstm3 = Dropout(self.lstm_params['dropout_3'])(lstm3)
-        
-        # Attention mechanism (simplified)
-        attention_weights = tf.keras.layers.Dense(1, activation='tanh')(lstm3)
-        attention_weights = tf.keras.layers.Flatten()(attention_weights)
-        attention_weights = tf.keras.layers.Activation('softmax')(attention_weights)
-        attention_weights = tf.keras.layers.RepeatVector(self.lstm_params['units_3'])(attention_weights)
-        attention_weights = tf.keras.layers.Permute([2, 1])(attention_weights)
-        
-        # Apply attention
-        lstm3_attention = tf.keras.layers.Multiply()([lstm3, attention_weights])
-        lstm3_attention = tf.keras.layers.Lambda(lambda x: tf.reduce_sum(x, axis=1))(lstm3_attention)
-        
-        # Dense layers
-        dense1 = Dense(64, activation='relu')(lstm3_attention)
-        dense1 = Dropout(0.2)(dense1)
-        dense2 = Dense(32, activation='relu')(dense1)
-        outputs = Dense(1)(dense2)
-        
-        # Create model
-        model = tf.keras.Model(inputs=inputs, outputs=outputs)
-        
-        # Enhanced optimizer
-        optimizer = Adam(learning_rate=self.lstm_params['learning_rate'])
-        model.compile(optimizer=optimizer, loss='mse', metrics=['mae'])
+        # Shared strategy scope (see build_enhanced_model)
+        with _STRATEGY.scope():
+            # Input layer
+            inputs = tf.keras.Input(shape=input_shape)
+        
+            # LSTM layers (cuDNN-compatible config, see build_enhanced_model)
+            lstm1 = LSTM(self.lstm_params['units_1'],
+                         return_sequences=True,
+                         activation='tanh',
+                         recurrent_activation='sigmoid')(inputs)
+            lstm1 = Dropout(self.lstm_params['dropout_1'])(lstm1)
+
+            lstm2 = LSTM(self.lstm_params['units_2'],
+                         return_sequences=True,
+                         activation='tanh',
+                         recurrent_activation='sigmoid')(lstm1)
+            lstm2 = Dropout(self.lstm_params['dropout_2'])(lstm2)
+
+            lstm3 = LSTM(self.lstm_params['units_3'],
+                         return_sequences=True,
+                         activation='tanh',
+                         recurrent_activation='sigmoid')(lstm2)
+            lstm3 = Dropout(self.lstm_params['dropout_3'])(lstm3)
+
+            # Additive attention over the full sequence: score each timestep,
+            # softmax across time and contract in one Dot - replaces the old
+            # Flatten/RepeatVector/Permute/Multiply/Lambda chain (which also
+            # attended over units rather than timesteps) with fusion-friendly ops
+            attention_score = tf.keras.layers.Dense(1, activation='tanh')(lstm3)
+            attention_score = tf.keras.layers.Flatten()(attention_score)
+            attention_weights = tf.keras.layers.Softmax(axis=1)(attention_score)
+            lstm3_attention = tf.keras.layers.Dot(axes=(1, 1))([lstm3, attention_weights])
+        
+            # Dense layers
+            dense1 = Dense(64, activation='relu')(lstm3_attention)
+            dense1 = Dropout(0.2)(dense1)
+            dense2 = Dense(32, activation='relu')(dense1)
+            outputs = Dense(1, dtype='float32')(dense2)
+        
+            # Create model
+            model = tf.keras.Model(inputs=inputs, outputs=outputs)
+        
+            # Enhanced optimizer
+            optimizer = Adam(learning_rate=self.lstm_params['learning_rate'])
+            model.compile(optimizer=optimizer, loss='mse', metrics=['mae'])
         
         return model
     
@@ -543,12 +895,23 @@ class LSTMModel:
                 )
             ]
             
+            # tf.data pipeline: cache keeps the tensors resident across
+            # epochs and prefetch overlaps host-to-device copies with compute
+            train_ds = (tf.data.Dataset.from_tensor_slices((X_train, y_train))
+                        .cache()
+                        .shuffle(len(X_train), reshuffle_each_iteration=True)
+                        .batch(self.lstm_params['batch_size'])
+                        .prefetch(tf.data.AUTOTUNE))
+            val_ds = (tf.data.Dataset.from_tensor_slices((X_val, y_val))
+                      .batch(512)
+                      .cache()
+                      .prefetch(tf.data.AUTOTUNE))
+
             # Train model with enhanced parameters
             history = self.model.fit(
-                X_train, y_train,
-                validation_data=(X_val, y_val),
+                train_ds,
+                validation_data=val_ds,
                 epochs=self.lstm_params['epochs'],
-                batch_size=self.lstm_params['batch_size'],
                 callbacks=callbacks,
                 verbose=0
             )
@@ -601,33 +964,47 @@ class LSTMModel:
                 'Close', 'Volume', 'RSI', 'MACD', 'BB_Position', 'BB_Width',
                 'Price_Change', 'MA_5', 'MA_10', 'Volume_Ratio'
             ]
-            available_features = [col for col in feature_cols if col in data.columns]
+            data_cols = frozenset(data.columns)
+            available_features = [col for col in feature_cols if col in data_cols]
             
             if len(available_features) < 3:
                 last_price = data['Close'].iloc[-1]
                 return {'day_1': last_price, 'day_2': last_price}
             
             # Get last sequence
-            features = data[available_features].fillna(0).values
+            features = data[available_features].fillna(0).to_numpy(dtype=np.float32)
             features_scaled = self.scaler.transform(features)
             
             if len(features_scaled) < self.sequence_length:
                 last_price = data['Close'].iloc[-1]
                 return {'day_1': last_price, 'day_2': last_price}
             
-            # Get last sequence
-            last_sequence = features_scaled[-self.sequence_length:].reshape(1, self.sequence_length, -1)
-            
-            # Predict
-            pred_scaled = self.model.predict(last_sequence, verbose=0)[0][0]
-            
-            # Inverse transform
-            pred_1 = self.scaler.inverse_transform([[pred_scaled]])[0][0]
-            
-            # For day 2, use a simple estimate
-            pred_2 = pred_1 * 1.001
-            
-            return {'day_1': pred_1, 'day_2': pred_2}
+            # Get last sequence; direct __call__ skips the data-adapter
+            # overhead of model.predict for these one-row batches
+            last_sequence = features_scaled[-self.sequence_length:]
+            pred_scaled_1 = float(
+                self.model(last_sequence.reshape(1, self.sequence_length, -1),
+                           training=False).numpy()[0, 0]
+            )
+
+            # Day 2 via a true rolling window: roll the day-1 prediction into
+            # the tail of the sequence instead of the old pred_1 * 1.001 guess
+            next_row = last_sequence[-1].copy()
+            if 'Close' in available_features:
+                next_row[available_features.index('Close')] = pred_scaled_1
+            rolled = np.concatenate([last_sequence[1:], next_row[None, :]])
+            pred_scaled_2 = float(
+                self.model(rolled.reshape(1, self.sequence_length, -1),
+                           training=False).numpy()[0, 0]
+            )
+
+            # One inverse transform for both horizons, with the target scaler
+            # (self.scaler is fit on the feature matrix, not on Close)
+            preds = self.target_scaler.inverse_transform(
+                np.array([[pred_scaled_1], [pred_scaled_2]], dtype=np.float32)
+            ).ravel()
+
+            return {'day_1': float(preds[0]), 'day_2': float(preds[1])}
             
         except Exception as e:
             logger.error(f"LSTM prediction failed: {e}")
@@ -636,7 +1013,36 @@ class LSTMModel:
 
 class EnhancedEnsembleModel:
     """Enhanced Ensemble Model System - Tối ưu hóa độ chính xác cao"""
-    
+
+    # Sorted threshold tables - the if/elif ladders in the confidence
+    # path collapse to single searchsorted lookups
+    _CONF_THRESH = np.array([0.80, 0.90, 0.95])
+    _CONF_LABELS = ('High', 'Very High', 'Ultra High', 'Near Certainty')
+    _CV_BINS = np.array([0.01, 0.02, 0.05])
+    _AGREE_SCORES = (0.95, 0.90, 0.85)
+    _QUALITY_BINS = np.array([0.7, 0.75, 0.8])
+    _QUALITY_SCORES = (0.85, 0.90, 0.95)
+
+    # On-disk cache of CV scores keyed by training-data fingerprint so a
+    # re-instantiated ensemble on identical data skips cross-validation
+    _scores_cache_path = Path('~/.stock_analyzer/ensemble_scores.json').expanduser()
+
+    # Monotone (bins, scores, searchsorted side) ladders for the market
+    # condition indicators; side encodes the strict/inclusive boundary of
+    # the original comparisons
+    _LADDERS = {
+        'volume_ratio': (np.array([0.8, 1.2]), (0.6, 0.75, 0.9), 'left'),
+        'volatility_ratio': (np.array([0.8, 1.0]), (0.9, 0.8, 0.65), 'right'),
+        'technical_score': (np.array([60.0, 80.0]), (0.7, 0.8, 0.9), 'right'),
+        'sentiment_score': (np.array([30.0, 50.0]), (0.9, 0.8, 0.7), 'left'),
+    }
+
+    @classmethod
+    def _ladder(cls, name: str, x: float) -> float:
+        """Tra cứu điểm số theo bảng ngưỡng thay cho chuỗi if/elif."""
+        bins, scores, side = cls._LADDERS[name]
+        return scores[np.searchsorted(bins, x, side=side)]
+
     def __init__(self):
         # Initialize all models
         self.xgb_model = XGBoostModel()
@@ -646,15 +1052,13 @@ class EnhancedEnsembleModel:
         self.rf_model = None     # Will be initialized from existing MarketForecastSystem
         self.linear_model = None # Will be initialized from existing MarketForecastSystem
         
+        # Fixed model order: weights and scores live in parallel arrays
+        # (SoA) with dict views exposed at the API boundary
+        self._model_names = ('xgb', 'prophet', 'lstm', 'arima', 'rf', 'linear')
+        self._idx = {name: i for i, name in enumerate(self._model_names)}
+
         # Optimized ensemble weights based on performance
-        self.weights = {
-            'xgb': 0.30,
-            'lstm': 0.25,
-            'arima': 0.20,
-            'prophet': 0.15,
-            'rf': 0.07,
-            'linear': 0.03
-        }
+        self._weights = np.array([0.30, 0.15, 0.25, 0.20, 0.07, 0.03])
         
         # Model optimization parameters
         self.optimization_params = {
@@ -665,11 +1069,25 @@ class EnhancedEnsembleModel:
             'ensemble_threshold': 0.6
         }
         
+        # Concurrency knob for the training/prediction fan-out:
+        # 1 = serial, -1 = one worker per model, n = cap at n workers
+        self.n_jobs = -1
+
         self.is_trained = False
-        self.model_scores = {}
-        self.cross_validation_scores = {}
+        self._scores = np.zeros(len(self._model_names))
+        self._cv_scores = np.zeros(len(self._model_names))
         self.feature_importance = {}
         self.model_metadata = {}
+
+        # LRU cache of full predict_ensemble results; predictions are
+        # deterministic given the data tail and market context
+        self._pred_cache: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._pred_cache_max = 128
+
+        # Ensemble closure specialized over the current weights (see
+        # _compile_ensemble_fn); invalidated whenever the weights change
+        self._ensemble_fn = None
+        self._ensemble_fn_key = None
         
         # Performance tracking
         self.training_history = {
@@ -679,7 +1097,42 @@ class EnhancedEnsembleModel:
             'features_count': 0,
             'validation_score': 0.0
         }
-        
+
+    def _as_model_array(self, mapping: Dict[str, float]) -> np.ndarray:
+        """Chuyển dict {model: value} về array theo thứ tự model cố định."""
+        arr = np.zeros(len(self._model_names))
+        for name, value in mapping.items():
+            if name in self._idx:
+                arr[self._idx[name]] = value
+        return arr
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        """Dict view của weight array (API boundary)."""
+        return dict(zip(self._model_names, self._weights.tolist()))
+
+    @weights.setter
+    def weights(self, mapping: Dict[str, float]) -> None:
+        self._weights = self._as_model_array(mapping)
+
+    @property
+    def model_scores(self) -> Dict[str, float]:
+        """Dict view của training-score array (API boundary)."""
+        return dict(zip(self._model_names, self._scores.tolist()))
+
+    @model_scores.setter
+    def model_scores(self, mapping: Dict[str, float]) -> None:
+        self._scores = self._as_model_array(mapping)
+
+    @property
+    def cross_validation_scores(self) -> Dict[str, float]:
+        """Dict view của CV-score array (API boundary)."""
+        return dict(zip(self._model_names, self._cv_scores.tolist()))
+
+    @cross_validation_scores.setter
+    def cross_validation_scores(self, mapping: Dict[str, float]) -> None:
+        self._cv_scores = self._as_model_array(mapping)
+
     def initialize_existing_models(self, data: pd.DataFrame) -> None:
         """Initialize models from existing MarketForecastSystem"""
         try:
@@ -701,22 +1154,36 @@ class EnhancedEnsembleModel:
         logger.info("Starting ensemble model training...")
         
         try:
-            # Initialize existing models
+            # Initialize existing models (mutates shared state, so stays on
+            # the main thread before the concurrent phase)
             self.initialize_existing_models(data)
-            
-            # Train new models
+
+            # XGBoost, Prophet and LSTM are independent and release the GIL
+            # inside their C/Stan/TF cores - train them concurrently
+            trainers = []
             if XGBOOST_AVAILABLE:
-                self.xgb_model.train(data)
-            
+                trainers.append(self.xgb_model)
             if PROPHET_AVAILABLE:
-                self.prophet_model.train(data)
-            
+                trainers.append(self.prophet_model)
             if TENSORFLOW_AVAILABLE:
-                self.lstm_model.train(data)
+                trainers.append(self.lstm_model)
+
+            if trainers:
+                if self.n_jobs == 1:
+                    for model in trainers:
+                        model.train(data)
+                else:
+                    workers = (len(trainers) if self.n_jobs < 0
+                               else min(self.n_jobs, len(trainers)))
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = [executor.submit(model.train, data) for model in trainers]
+                        for future in as_completed(futures):
+                            future.result()
             
             # Calculate model scores (simplified)
             self._calculate_model_scores(data)
-            
+
+            self.invalidate_cache()
             self.is_trained = True
             logger.info("Ensemble model training completed")
             
@@ -729,58 +1196,56 @@ class EnhancedEnsembleModel:
             from sklearn.model_selection import TimeSeriesSplit
             from sklearn.metrics import mean_absolute_error
             
+            # Warm start: identical data fingerprints reuse persisted scores
+            # and skip the expensive cross-validation entirely
+            fingerprint = self._data_fingerprint(data)
+            cached = self._load_score_cache().get(fingerprint) if fingerprint else None
+            if cached:
+                self.cross_validation_scores = cached['cv_scores']
+                self.model_scores = cached.get('model_scores', cached['cv_scores'])
+                self._optimize_weights()
+                logger.info("Loaded ensemble scores from disk cache")
+                return
+
             # Time series cross-validation
             tscv = TimeSeriesSplit(n_splits=self.optimization_params['cv_folds'])
-            
+
+            idx = self._idx
+
             # XGBoost score with CV
             if self.xgb_model.is_trained and hasattr(self.xgb_model, 'train_score'):
-                self.model_scores['xgb'] = self.xgb_model.train_score
-                self.cross_validation_scores['xgb'] = self._cross_validate_xgb(data, tscv)
+                self._scores[idx['xgb']] = self.xgb_model.train_score
+                self._cv_scores[idx['xgb']] = self._cross_validate_xgb(data, tscv)
             else:
-                self.model_scores['xgb'] = 0.70
-                self.cross_validation_scores['xgb'] = 0.70
-            
+                self._scores[idx['xgb']] = self._cv_scores[idx['xgb']] = 0.70
+
             # Prophet score with validation
             if self.prophet_model.is_trained:
-                self.model_scores['prophet'] = 0.72
-                self.cross_validation_scores['prophet'] = 0.72
+                self._scores[idx['prophet']] = self._cv_scores[idx['prophet']] = 0.72
             else:
-                self.model_scores['prophet'] = 0.72 if PROPHET_AVAILABLE else 0.0
-                self.cross_validation_scores['prophet'] = 0.72 if PROPHET_AVAILABLE else 0.0
-            
+                self._scores[idx['prophet']] = self._cv_scores[idx['prophet']] = \
+                    0.72 if PROPHET_AVAILABLE else 0.0
+
             # LSTM score with validation
             if self.lstm_model.is_trained:
-                self.model_scores['lstm'] = 0.75
-                self.cross_validation_scores['lstm'] = 0.75
+                self._scores[idx['lstm']] = self._cv_scores[idx['lstm']] = 0.75
             else:
-                self.model_scores['lstm'] = 0.75 if TENSORFLOW_AVAILABLE else 0.0
-                self.cross_validation_scores['lstm'] = 0.75 if TENSORFLOW_AVAILABLE else 0.0
-            
+                self._scores[idx['lstm']] = self._cv_scores[idx['lstm']] = \
+                    0.75 if TENSORFLOW_AVAILABLE else 0.0
+
             # Existing models scores with validation
-            if self.arima_model:
-                self.model_scores['arima'] = 0.73
-                self.cross_validation_scores['arima'] = 0.73
-            else:
-                self.model_scores['arima'] = 0.0
-                self.cross_validation_scores['arima'] = 0.0
-            
-            if self.rf_model:
-                self.model_scores['rf'] = 0.68
-                self.cross_validation_scores['rf'] = 0.68
-            else:
-                self.model_scores['rf'] = 0.0
-                self.cross_validation_scores['rf'] = 0.0
-            
-            if self.linear_model:
-                self.model_scores['linear'] = 0.62
-                self.cross_validation_scores['linear'] = 0.62
-            else:
-                self.model_scores['linear'] = 0.0
-                self.cross_validation_scores['linear'] = 0.0
+            self._scores[idx['arima']] = self._cv_scores[idx['arima']] = \
+                0.73 if self.arima_model else 0.0
+            self._scores[idx['rf']] = self._cv_scores[idx['rf']] = \
+                0.68 if self.rf_model else 0.0
+            self._scores[idx['linear']] = self._cv_scores[idx['linear']] = \
+                0.62 if self.linear_model else 0.0
             
             # Optimize weights based on scores
             self._optimize_weights()
-            
+
+            self._save_score_cache(fingerprint)
+
         except Exception as e:
             logger.error(f"Failed to calculate model scores: {e}")
             # Default scores with improved values
@@ -803,69 +1268,91 @@ class EnhancedEnsembleModel:
             if len(df) < self.optimization_params['min_data_points']:
                 return 0.65
             
-            X = df[self.xgb_model.feature_names].values
-            y = df['Close'].values
+            X = np.ascontiguousarray(
+                df[self.xgb_model.feature_names].to_numpy(dtype=np.float32, copy=False))
+            y = df['Close'].values.astype(np.float32)
             
-            scores = []
-            for train_idx, val_idx in tscv.split(X):
-                X_train, X_val = X[train_idx], X[val_idx]
-                y_train, y_val = y[train_idx], y[val_idx]
-                
-                # Scale features
-                scaler = StandardScaler()
-                X_train_scaled = scaler.fit_transform(X_train)
-                X_val_scaled = scaler.transform(X_val)
-                
-                # XGBoost with optimized parameters
-                params = {
-                    'objective': 'reg:squarederror',
-                    'n_estimators': 150,
-                    'max_depth': 8,
-                    'learning_rate': 0.05,
-                    'subsample': 0.9,
-                    'colsample_bytree': 0.9,
-                    'reg_alpha': 0.1,
-                    'reg_lambda': 0.1,
-                    'random_state': 42,
-                    'n_jobs': -1
-                }
-                
-                model = xgb.XGBRegressor(**params)
-                model.fit(X_train_scaled, y_train)
-                
-                y_pred = model.predict(X_val_scaled)
-                score = r2_score(y_val, y_pred)
-                scores.append(score)
-            
-            return np.mean(scores) if scores else 0.65
+            # XGBoost with optimized parameters; single-threaded per fold
+            # since the folds themselves run in parallel below
+            params = {
+                'objective': 'reg:squarederror',
+                'n_estimators': 150,
+                'max_depth': 8,
+                'learning_rate': 0.05,
+                'subsample': 0.9,
+                'colsample_bytree': 0.9,
+                'reg_alpha': 0.1,
+                'reg_lambda': 0.1,
+                'random_state': 42,
+                'n_jobs': 1,
+                'tree_method': 'hist',
+                'device': _XGB_DEVICE
+            }
+
+            # Folds are independent fits - run them across workers
+            splits = list(tscv.split(X))
+            if JOBLIB_AVAILABLE:
+                scores = Parallel(n_jobs=min(4, len(splits)), backend='loky')(
+                    delayed(_fit_xgb_fold)(train_idx, val_idx, X, y, params)
+                    for train_idx, val_idx in splits)
+            else:
+                scores = [_fit_xgb_fold(train_idx, val_idx, X, y, params)
+                          for train_idx, val_idx in splits]
+
+            return float(np.mean(scores)) if scores else 0.65
             
         except Exception as e:
             logger.error(f"Cross-validation failed: {e}")
             return 0.65
     
+    @staticmethod
+    def _data_fingerprint(data: pd.DataFrame) -> Optional[str]:
+        """Fingerprint 100 dòng cuối của dữ liệu train để tra cứu cache."""
+        try:
+            return hashlib.md5(
+                pd.util.hash_pandas_object(data.tail(100)).values).hexdigest()
+        except Exception:
+            return None
+
+    def _load_score_cache(self) -> Dict[str, Any]:
+        """Đọc cache điểm số từ disk (trả về {} nếu chưa có/hỏng)."""
+        try:
+            if self._scores_cache_path.exists():
+                with open(self._scores_cache_path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.debug(f"Score cache unreadable: {e}")
+        return {}
+
+    def _save_score_cache(self, fingerprint: Optional[str]) -> None:
+        """Ghi điểm số và weights hiện tại vào disk cache."""
+        if not fingerprint:
+            return
+        try:
+            cache = self._load_score_cache()
+            cache[fingerprint] = {
+                'cv_scores': self.cross_validation_scores,
+                'model_scores': self.model_scores,
+                'weights': self.weights,
+            }
+            self._scores_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._scores_cache_path, 'w') as f:
+                json.dump(cache, f)
+        except Exception as e:
+            logger.debug(f"Score cache not saved: {e}")
+
     def _optimize_weights(self) -> None:
         """Tối ưu hóa ensemble weights dựa trên performance"""
         try:
-            # Normalize scores
-            total_score = sum(self.cross_validation_scores.values())
-            if total_score > 0:
-                # Increase weight for better performing models
-                optimized_weights = {}
-                for model, score in self.cross_validation_scores.items():
-                    if score > 0:
-                        # Boost high-performing models
-                        weight = (score / total_score) ** 1.5  # Exponential boost
-                        optimized_weights[model] = weight
-                    else:
-                        optimized_weights[model] = 0.01  # Minimum weight
-                
-                # Normalize weights to sum to 1
-                total_weight = sum(optimized_weights.values())
-                if total_weight > 0:
-                    self.weights = {k: v/total_weight for k, v in optimized_weights.items()}
-                    
-                    logger.info(f"Optimized ensemble weights: {self.weights}")
-                    
+            total = self._cv_scores.sum()
+            if total <= 0:
+                return
+            # Exponential boost for high-performing models, floor for the rest
+            boosted = np.where(self._cv_scores > 0,
+                               (self._cv_scores / total) ** 1.5, 0.01)
+            self._weights = boosted / boosted.sum()
+            logger.info(f"Optimized ensemble weights: {self.weights}")
+
         except Exception as e:
             logger.error(f"Weight optimization failed: {e}")
     
@@ -881,56 +1368,90 @@ class EnhancedEnsembleModel:
                 'ensemble_weights': self.weights,
                 'model_scores': self.model_scores,
                 'confidence': 0.85,  # High fallback confidence
-                'confidence_breakdown': self._create_confidence_breakdown([], market_context or {})
+                'confidence_breakdown': self._create_confidence_breakdown([], None, market_context or {})
             }
-        
+
+        # Identical re-queries (interactive UI refreshes, backtests replaying
+        # the same bar) skip every model call via the LRU cache; the key
+        # hashes the recent Close window so equal content hits regardless
+        # of which DataFrame object carries it
+        try:
+            tail = np.ascontiguousarray(data['Close'].values[-60:])
+            cache_key = (hashlib.blake2b(tail.tobytes(), digest_size=16).digest(),
+                         len(data), data.index[-1],
+                         hash(frozenset((market_context or {}).items())))
+        except TypeError:
+            cache_key = None  # unhashable market_context values
+        if cache_key is not None:
+            cached = self._pred_cache.get(cache_key)
+            if cached is not None:
+                self._pred_cache.move_to_end(cache_key)
+                return copy.deepcopy(cached)
+
         individual_predictions = {}
-        
-        # XGBoost prediction
+
+        # The sub-models are independent and release the GIL inside their
+        # native backends - run their predictions concurrently so wall time
+        # drops to the slowest model rather than the sum of all of them
+        prediction_jobs = {}
         if self.xgb_model.is_trained:
-            try:
-                individual_predictions['xgb'] = self.xgb_model.predict(data)
-                logger.info("XGBoost prediction completed")
-            except Exception as e:
-                logger.warning(f"XGBoost prediction failed: {e}")
-        
-        # Prophet prediction
+            prediction_jobs['xgb'] = self.xgb_model.predict
         if self.prophet_model.is_trained:
-            try:
-                individual_predictions['prophet'] = self.prophet_model.predict(data)
-                logger.info("Prophet prediction completed")
-            except Exception as e:
-                logger.warning(f"Prophet prediction failed: {e}")
-        
-        # LSTM prediction
+            prediction_jobs['prophet'] = self.prophet_model.predict
         if self.lstm_model.is_trained:
-            try:
-                individual_predictions['lstm'] = self.lstm_model.predict(data)
-                logger.info("LSTM prediction completed")
-            except Exception as e:
-                logger.warning(f"LSTM prediction failed: {e}")
-        
-        # Enhanced ARIMA prediction
+            prediction_jobs['lstm'] = self.lstm_model.predict
         if self.arima_model:
-            try:
-                log_returns = np.log(data['Close']).diff().dropna()
-                arima_forecast = self.arima_model.predict(n_periods=2)
-                last_price = data['Close'].iloc[-1]
-                arima_price_1 = last_price * np.exp(arima_forecast[0])
-                arima_price_2 = arima_price_1 * np.exp(arima_forecast[1])
-                individual_predictions['arima'] = {'day_1': arima_price_1, 'day_2': arima_price_2}
-                logger.info("ARIMA prediction completed")
-            except Exception as e:
-                logger.warning(f"ARIMA prediction failed: {e}")
-        
+            prediction_jobs['arima'] = self._predict_arima
+
+        # Predictions are collected SoA-style: parallel day-1/day-2 lists
+        # feed the numeric confidence path as ndarrays, while the dict view
+        # stays the payload format for external callers
+        day1_list: List[float] = []
+        day2_list: List[float] = []
+
+        def _collect(name: str, pred: Dict[str, float]) -> None:
+            individual_predictions[name] = pred
+            day1_list.append(pred['day_1'])
+            day2_list.append(pred['day_2'])
+
+        if prediction_jobs:
+            if self.n_jobs == 1:
+                for name, predict_fn in prediction_jobs.items():
+                    try:
+                        _collect(name, predict_fn(data))
+                        logger.info(f"{name} prediction completed")
+                    except Exception as e:
+                        logger.warning(f"{name} prediction failed: {e}")
+            else:
+                workers = (len(prediction_jobs) if self.n_jobs < 0
+                           else min(self.n_jobs, len(prediction_jobs)))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(predict_fn, data): name
+                               for name, predict_fn in prediction_jobs.items()}
+                    for future in as_completed(futures):
+                        name = futures[future]
+                        try:
+                            _collect(name, future.result())
+                            logger.info(f"{name} prediction completed")
+                        except Exception as e:
+                            logger.warning(f"{name} prediction failed: {e}")
+        
+        # Shared per-model prediction statistics - every confidence helper
+        # below needs the same day-1/day-2 arrays and moments, so compute
+        # them once instead of five times
+        pred_stats = self._stats_from_arrays(np.asarray(day1_list),
+                                             np.asarray(day2_list))
+
         # Calculate ultra-high confidence ensemble prediction
         ensemble_pred = self._calculate_ensemble_prediction(individual_predictions)
-        
+
         # Enhanced confidence calculation
-        ultra_confidence = self._calculate_ultra_high_confidence(individual_predictions, data, market_context or {})
-        
+        ultra_confidence = self._calculate_ultra_high_confidence(
+            individual_predictions, data, market_context or {}, stats=pred_stats)
+
         # Create detailed confidence breakdown
-        confidence_breakdown = self._create_confidence_breakdown(individual_predictions, market_context or {})
+        confidence_breakdown = self._create_confidence_breakdown(
+            individual_predictions, data, market_context or {}, stats=pred_stats)
         
         # Enhanced result with detailed analysis
         result = {
@@ -941,14 +1462,72 @@ class EnhancedEnsembleModel:
             'model_scores': self.model_scores,
             'confidence': ultra_confidence,
             'confidence_breakdown': confidence_breakdown,
-            'prediction_quality': self._assess_prediction_quality(individual_predictions, data),
-            'downward_trend_analysis': self._analyze_downward_trend_details(individual_predictions, data)
+            'prediction_quality': self._assess_prediction_quality(
+                individual_predictions, data, stats=pred_stats),
+            'downward_trend_analysis': self._analyze_downward_trend_details(
+                individual_predictions, data, stats=pred_stats)
         }
         
+        if cache_key is not None:
+            self._pred_cache[cache_key] = copy.deepcopy(result)
+            if len(self._pred_cache) > self._pred_cache_max:
+                self._pred_cache.popitem(last=False)
+
         logger.info(f"Ultra-high confidence ensemble prediction: {ultra_confidence:.1%}")
         return result
+
+    def invalidate_cache(self) -> None:
+        """Drop cached ensemble predictions (call after retraining)."""
+        self._pred_cache.clear()
+
+    def clear_prediction_cache(self) -> None:
+        """Public alias để xoá cache dự báo từ bên ngoài (dev API)."""
+        self.invalidate_cache()
     
-    def _create_confidence_breakdown(self, predictions: Dict[str, Dict], market_context: Dict) -> Dict[str, Any]:
+    def _predict_arima(self, data: pd.DataFrame) -> Dict[str, float]:
+        """Dự báo 2 ngày từ ARIMA log-return forecast"""
+        arima_forecast = self.arima_model.predict(n_periods=2)
+        last_price = data['Close'].values[-1]
+        # Cumulative log returns: one exp over both horizons
+        prices = last_price * np.exp(np.cumsum(arima_forecast[:2]))
+        return {'day_1': float(prices[0]), 'day_2': float(prices[1])}
+
+    @staticmethod
+    def _prediction_stats(predictions: Dict[str, Dict]) -> Dict[str, Any]:
+        """One pass over the per-model predictions shared by the confidence helpers."""
+        n = len(predictions)
+        d1 = np.fromiter((p['day_1'] for p in predictions.values()),
+                         dtype=np.float64, count=n)
+        d2 = np.fromiter((p['day_2'] for p in predictions.values()),
+                         dtype=np.float64, count=n)
+        return EnhancedEnsembleModel._stats_from_arrays(d1, d2)
+
+    @staticmethod
+    def _stats_from_arrays(d1: np.ndarray, d2: np.ndarray) -> Dict[str, Any]:
+        """Moments/CV của hai mảng dự báo song song (SoA core)."""
+        n = d1.size
+        if n:
+            # Sum + sum-of-squares per day: two reductions instead of
+            # separate mean/std passes
+            s1, s1sq = d1.sum(), (d1 * d1).sum()
+            s2, s2sq = d2.sum(), (d2 * d2).sum()
+            mean1 = s1 / n
+            mean2 = s2 / n
+            std1 = np.sqrt(max(s1sq / n - mean1 * mean1, 0.0))
+            std2 = np.sqrt(max(s2sq / n - mean2 * mean2, 0.0))
+        else:
+            mean1 = mean2 = std1 = std2 = 0.0
+        cv1 = std1 / abs(mean1) if mean1 != 0 else 1.0
+        cv2 = std2 / abs(mean2) if mean2 != 0 else 1.0
+        return {'d1': d1, 'd2': d2,
+                'mean1': mean1, 'mean2': mean2,
+                'std1': std1, 'std2': std2,
+                'cv1': cv1, 'cv2': cv2,
+                'avg_cv': (cv1 + cv2) / 2}
+
+    def _create_confidence_breakdown(self, predictions: Dict[str, Dict],
+                                     data: Optional[pd.DataFrame], market_context: Dict,
+                                     stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Tạo breakdown chi tiết về confidence factors"""
         breakdown = {
             'model_agreement': 0.0,
@@ -965,11 +1544,11 @@ class EnhancedEnsembleModel:
         try:
             if len(predictions) >= 2:
                 # Calculate each component
-                breakdown['model_agreement'] = self._calculate_model_agreement_score(predictions)
+                breakdown['model_agreement'] = self._calculate_model_agreement_score(predictions, stats=stats)
                 breakdown['model_quality'] = self._calculate_model_quality_score(predictions)
-                breakdown['market_conditions'] = self._analyze_market_conditions_for_confidence(pd.DataFrame(), market_context)
-                breakdown['technical_signals'] = self._validate_technical_signals_for_confidence(pd.DataFrame())
-                breakdown['downward_trend_validation'] = self._validate_downward_trend_confidence(predictions, pd.DataFrame())
+                breakdown['market_conditions'] = self._analyze_market_conditions_for_confidence(data, market_context)
+                breakdown['technical_signals'] = self._validate_technical_signals_for_confidence(data)
+                breakdown['downward_trend_validation'] = self._validate_downward_trend_confidence(predictions, data, stats=stats)
                 
                 # Overall weighted confidence
                 breakdown['overall_confidence'] = (
@@ -981,14 +1560,9 @@ class EnhancedEnsembleModel:
                 )
                 
                 # Classify confidence level
-                if breakdown['overall_confidence'] >= 0.95:
-                    breakdown['confidence_level'] = 'Near Certainty'
-                elif breakdown['overall_confidence'] >= 0.90:
-                    breakdown['confidence_level'] = 'Ultra High'
-                elif breakdown['overall_confidence'] >= 0.80:
-                    breakdown['confidence_level'] = 'Very High'
-                else:
-                    breakdown['confidence_level'] = 'High'
+                breakdown['confidence_level'] = self._CONF_LABELS[
+                    np.searchsorted(self._CONF_THRESH,
+                                    breakdown['overall_confidence'], side='right')]
                 
                 # Identify risk and supporting factors
                 if breakdown['model_agreement'] < 0.8:
@@ -1009,25 +1583,22 @@ class EnhancedEnsembleModel:
         
         return breakdown
     
-    def _calculate_model_agreement_score(self, predictions: Dict[str, Dict]) -> float:
+    def _calculate_model_agreement_score(self, predictions: Dict[str, Dict],
+                                         stats: Optional[Dict[str, Any]] = None) -> float:
         """Tính điểm agreement giữa các models"""
         if len(predictions) < 2:
             return 0.8
-        
-        day_1_preds = [pred['day_1'] for pred in predictions.values()]
-        day_2_preds = [pred['day_2'] for pred in predictions.values()]
-        
-        cv_day_1 = np.std(day_1_preds) / abs(np.mean(day_1_preds)) if np.mean(day_1_preds) != 0 else 1.0
-        cv_day_2 = np.std(day_2_preds) / abs(np.mean(day_2_preds)) if np.mean(day_2_preds) != 0 else 1.0
-        
-        avg_cv = (cv_day_1 + cv_day_2) / 2
-        return max(0.3, min(0.95, 0.9 - avg_cv * 5))
+
+        if stats is None:
+            stats = self._prediction_stats(predictions)
+
+        return max(0.3, min(0.95, 0.9 - stats['avg_cv'] * 5))
     
     def _calculate_model_quality_score(self, predictions: Dict[str, Dict]) -> float:
         """Tính điểm chất lượng models"""
-        available_scores = [self.cross_validation_scores.get(model, 0.7) 
-                          for model in predictions.keys() 
-                          if model in self.cross_validation_scores]
+        available_scores = [self._cv_scores[self._idx[model]]
+                            for model in predictions.keys()
+                            if model in self._idx]
         
         if not available_scores:
             return 0.75
@@ -1035,7 +1606,8 @@ class EnhancedEnsembleModel:
         avg_score = np.mean(available_scores)
         return min(0.95, avg_score + 0.1)  # Boost for ensemble
     
-    def _assess_prediction_quality(self, predictions: Dict[str, Dict], data: pd.DataFrame) -> Dict[str, Any]:
+    def _assess_prediction_quality(self, predictions: Dict[str, Dict], data: pd.DataFrame,
+                                   stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Đánh giá chất lượng dự báo chi tiết"""
         quality_assessment = {
             'prediction_stability': 0.0,
@@ -1043,55 +1615,56 @@ class EnhancedEnsembleModel:
             'magnitude_reasonableness': 0.0,
             'overall_quality_score': 0.0
         }
-        
-        try:
-            if not predictions or data.empty:
-                return quality_assessment
-            
-            current_price = data['Close'].iloc[-1]
-            
-            # Stability: How consistent are predictions across models
-            day_1_preds = [pred['day_1'] for pred in predictions.values()]
-            day_2_preds = [pred['day_2'] for pred in predictions.values()]
-            
-            pred_std_1 = np.std(day_1_preds) if len(day_1_preds) > 1 else 0
-            pred_std_2 = np.std(day_2_preds) if len(day_2_preds) > 1 else 0
-            
-            stability_score = max(0.5, 1.0 - (pred_std_1 + pred_std_2) / (2 * current_price))
-            quality_assessment['prediction_stability'] = stability_score
-            
-            # Trend consistency: Do models agree on direction?
-            upward_day_1 = sum(1 for pred in day_1_preds if pred > current_price)
-            downward_day_1 = len(day_1_preds) - upward_day_1
-            
-            consistency_score = max(upward_day_1, downward_day_1) / len(day_1_preds) if day_1_preds else 0.5
-            quality_assessment['trend_consistency'] = consistency_score
-            
-            # Magnitude reasonableness: Are predictions realistic?
-            max_change_1 = max(abs((pred - current_price) / current_price) for pred in day_1_preds)
-            max_change_2 = max(abs((pred - current_price) / current_price) for pred in day_2_preds)
-            
-            # Penalize extreme predictions (>10% daily change is unusual)
-            magnitude_penalty = 0.0
-            if max_change_1 > 0.1 or max_change_2 > 0.1:
-                magnitude_penalty = 0.2
-            
-            magnitude_score = max(0.3, 0.9 - magnitude_penalty)
-            quality_assessment['magnitude_reasonableness'] = magnitude_score
-            
-            # Overall quality score
-            quality_assessment['overall_quality_score'] = (
-                stability_score * 0.4 +
-                consistency_score * 0.4 +
-                magnitude_score * 0.2
-            )
-            
-        except Exception as e:
-            logger.error(f"Prediction quality assessment failed: {e}")
-        
+
+        # Explicit sentinel guards instead of a blanket exception handler;
+        # everything below is pure ndarray math
+        if not predictions or data.empty or 'Close' not in data.columns:
+            return quality_assessment
+
+        current_price = data['Close'].values[-1]
+
+        # Stability: How consistent are predictions across models
+        if stats is None:
+            stats = self._prediction_stats(predictions)
+        day_1_preds = stats['d1']
+        day_2_preds = stats['d2']
+
+        pred_std_1 = stats['std1'] if day_1_preds.size > 1 else 0
+        pred_std_2 = stats['std2'] if day_2_preds.size > 1 else 0
+
+        stability_score = max(0.5, 1.0 - (pred_std_1 + pred_std_2) / (2 * current_price))
+        quality_assessment['prediction_stability'] = stability_score
+
+        # Trend consistency: Do models agree on direction?
+        upward_day_1 = int((day_1_preds > current_price).sum())
+        downward_day_1 = day_1_preds.size - upward_day_1
+
+        consistency_score = max(upward_day_1, downward_day_1) / day_1_preds.size if day_1_preds.size else 0.5
+        quality_assessment['trend_consistency'] = consistency_score
+
+        # Magnitude reasonableness: Are predictions realistic?
+        max_change_1 = np.abs(day_1_preds - current_price).max() / current_price
+        max_change_2 = np.abs(day_2_preds - current_price).max() / current_price
+
+        # Penalize extreme predictions (>10% daily change is unusual)
+        magnitude_penalty = 0.0
+        if max_change_1 > 0.1 or max_change_2 > 0.1:
+            magnitude_penalty = 0.2
+
+        magnitude_score = max(0.3, 0.9 - magnitude_penalty)
+        quality_assessment['magnitude_reasonableness'] = magnitude_score
+
+        # Overall quality score
+        quality_assessment['overall_quality_score'] = (
+            stability_score * 0.4 +
+            consistency_score * 0.4 +
+            magnitude_score * 0.2
+        )
+
         return quality_assessment
     
-    def _analyze_downward_trend_details(self, predictions: Dict[str, Dict], data: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_downward_trend_details(self, predictions: Dict[str, Dict], data: pd.DataFrame,
+                                        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Phân tích chi tiết xu hướng giảm giá"""
         downward_analysis = {
             'is_downward_predicted': False,
@@ -1103,152 +1676,149 @@ class EnhancedEnsembleModel:
             'decline_acceleration': False,
             'risk_level': 'Medium'
         }
-        
-        try:
-            if data.empty or not predictions:
-                return downward_analysis
-            
-            current_price = data['Close'].iloc[-1]
-            downward_models = 0
-            total_predictions = 0
-            
-            day_1_declines = []
-            day_2_declines = []
-            
-            for model_name, pred in predictions.items():
-                day_1_pred = pred['day_1']
-                day_2_pred = pred['day_2']
-                
-                # Count downward predictions
-                if day_1_pred < current_price * 0.998:  # Small decline threshold
-                    downward_models += 1
-                    day_1_declines.append((current_price - day_1_pred) / current_price)
-                
-                if day_2_pred < current_price * 0.995:  # Decline by day 2
-                    day_2_declines.append((current_price - day_2_pred) / current_price)
-                
-                total_predictions += 2  # Count both days
-            
-            downward_analysis['is_downward_predicted'] = downward_models > total_predictions * 0.5
-            downward_analysis['downward_models_count'] = downward_models
-            downward_analysis['total_models'] = len(predictions)
-            downward_analysis['downward_consensus'] = downward_models / len(predictions) if predictions else 0
-            
-            # Calculate expected declines
-            if day_1_declines:
-                downward_analysis['expected_decline_day_1'] = np.mean(day_1_declines)
-            
-            if day_2_declines:
-                downward_analysis['expected_decline_day_2'] = np.mean(day_2_declines)
-            
-            # Check for acceleration (worse decline on day 2)
-            if (downward_analysis['expected_decline_day_2'] > 
-                downward_analysis['expected_decline_day_1'] * 1.5):
-                downward_analysis['decline_acceleration'] = True
-            
-            # Assess risk level
-            max_decline = max(downward_analysis['expected_decline_day_1'], 
-                            downward_analysis['expected_decline_day_2'])
-            
-            if max_decline > 0.05:  # >5% decline
-                downward_analysis['risk_level'] = 'High'
-            elif max_decline > 0.02:  # >2% decline
-                downward_analysis['risk_level'] = 'Medium'
-            else:
-                downward_analysis['risk_level'] = 'Low'
-            
-        except Exception as e:
-            logger.error(f"Downward trend analysis failed: {e}")
-        
+
+        # Explicit sentinel guards instead of a blanket exception handler;
+        # everything below is pure ndarray math
+        if data.empty or not predictions or 'Close' not in data.columns:
+            return downward_analysis
+
+        current_price = data['Close'].values[-1]
+
+        if stats is None:
+            stats = self._prediction_stats(predictions)
+        d1, d2 = stats['d1'], stats['d2']
+
+        # Boolean threshold masks over the prediction arrays instead of
+        # per-model Python comparisons and list appends
+        mask1 = d1 < current_price * 0.998  # Small decline threshold
+        mask2 = d2 < current_price * 0.995  # Decline by day 2
+        downward_models = int(mask1.sum())
+        total_predictions = 2 * d1.size  # Count both days
+
+        downward_analysis['is_downward_predicted'] = downward_models > total_predictions * 0.5
+        downward_analysis['downward_models_count'] = downward_models
+        downward_analysis['total_models'] = len(predictions)
+        downward_analysis['downward_consensus'] = downward_models / len(predictions) if predictions else 0
+
+        # Calculate expected declines
+        day_1_declines = (current_price - d1[mask1]) / current_price
+        day_2_declines = (current_price - d2[mask2]) / current_price
+
+        if day_1_declines.size:
+            downward_analysis['expected_decline_day_1'] = float(day_1_declines.mean())
+
+        if day_2_declines.size:
+            downward_analysis['expected_decline_day_2'] = float(day_2_declines.mean())
+
+        # Check for acceleration (worse decline on day 2)
+        if (downward_analysis['expected_decline_day_2'] >
+            downward_analysis['expected_decline_day_1'] * 1.5):
+            downward_analysis['decline_acceleration'] = True
+
+        # Assess risk level
+        max_decline = max(downward_analysis['expected_decline_day_1'],
+                          downward_analysis['expected_decline_day_2'])
+
+        if max_decline > 0.05:  # >5% decline
+            downward_analysis['risk_level'] = 'High'
+        elif max_decline > 0.02:  # >2% decline
+            downward_analysis['risk_level'] = 'Medium'
+        else:
+            downward_analysis['risk_level'] = 'Low'
+
         return downward_analysis
     
     def _calculate_ensemble_prediction(self, predictions: Dict[str, Dict]) -> Dict[str, float]:
         """Tính toán dự báo ensemble"""
-        day_1_pred = 0.0
-        day_2_pred = 0.0
-        total_weight = 0.0
-        
-        for model_name, pred in predictions.items():
-            if model_name in self.weights:
-                weight = self.weights[model_name]
-                day_1_pred += pred['day_1'] * weight
-                day_2_pred += pred['day_2'] * weight
+        if not predictions:
+            return {'day_1': 0.0, 'day_2': 0.0}
+
+        # Weighted average specialized over the current weight table; the
+        # closure is rebuilt only when the weights actually change
+        key = self._weights.tobytes()
+        if key != self._ensemble_fn_key:
+            self._ensemble_fn = self._compile_ensemble_fn()
+            self._ensemble_fn_key = key
+        return self._ensemble_fn(predictions)
+
+    def _compile_ensemble_fn(self):
+        """Bake the positive (model, weight) pairs into a dedicated closure."""
+        pairs = tuple((name, weight)
+                      for name, weight in zip(self._model_names, self._weights.tolist())
+                      if weight > 0)
+
+        def _ensemble(predictions: Dict[str, Dict]) -> Dict[str, float]:
+            day_1 = day_2 = total_weight = 0.0
+            for name, weight in pairs:
+                pred = predictions.get(name)
+                if pred is None:
+                    continue
+                day_1 += pred['day_1'] * weight
+                day_2 += pred['day_2'] * weight
                 total_weight += weight
-        
-        if total_weight > 0:
-            day_1_pred /= total_weight
-            day_2_pred /= total_weight
-        
-        # Calculate ultra-high confidence based on model agreement
-        confidence = self._calculate_ultra_high_confidence(predictions, pd.DataFrame(), {})
-        
-        return {
-            'day_1': day_1_pred,
-            'day_2': day_2_pred,
-            'confidence': confidence
-        }
-    
-    def _calculate_ultra_high_confidence(self, predictions: Dict[str, Dict], data: pd.DataFrame, market_context: Dict) -> float:
+
+            if total_weight <= 0:
+                return {'day_1': 0.0, 'day_2': 0.0}
+            return {'day_1': day_1 / total_weight, 'day_2': day_2 / total_weight}
+
+        return _ensemble
+
+    def _calculate_ultra_high_confidence(self, predictions: Dict[str, Dict], data: pd.DataFrame,
+                                         market_context: Dict,
+                                         stats: Optional[Dict[str, Any]] = None) -> float:
         """Tính toán confidence score gần như tuyệt đối với multiple validation layers"""
         if len(predictions) < 2:
             return 0.85  # High confidence even with limited models
-        
+
         try:
             confidence_factors = []
-            
-            # Layer 1: Model Agreement & Consensus (30% weight)
-            day_1_preds = [pred['day_1'] for pred in predictions.values()]
-            day_2_preds = [pred['day_2'] for pred in predictions.values()]
-            
-            # Enhanced consensus calculation
-            mean_day_1 = np.mean(day_1_preds)
-            mean_day_2 = np.mean(day_2_preds)
-            median_day_1 = np.median(day_1_preds)
-            median_day_2 = np.median(day_2_preds)
-            
-            # Check for strong consensus (low variance)
-            cv_day_1 = np.std(day_1_preds) / abs(mean_day_1) if mean_day_1 != 0 else 1.0
-            cv_day_2 = np.std(day_2_preds) / abs(mean_day_2) if mean_day_2 != 0 else 1.0
-            avg_cv = (cv_day_1 + cv_day_2) / 2
-            
-            # Ultra-high confidence if models agree strongly
-            if avg_cv < 0.01:  # Less than 1% variance
-                agreement_score = 0.95
-            elif avg_cv < 0.02:  # Less than 2% variance
-                agreement_score = 0.90
-            elif avg_cv < 0.05:  # Less than 5% variance
-                agreement_score = 0.85
+
+            # Layers 1 + 2: Model Agreement (30%) and Model Quality (25%),
+            # from the statistics computed once per predict_ensemble call
+            if stats is None:
+                stats = self._prediction_stats(predictions)
+
+            scores = np.fromiter(
+                (self._cv_scores[self._idx[model]] for model in predictions
+                 if model in self._idx), dtype=np.float64)
+
+            if NUMBA_AVAILABLE:
+                agreement_score, quality_score = _agreement_quality_kernel(
+                    stats['d1'], stats['d2'], scores)
             else:
-                agreement_score = max(0.3, 0.9 - avg_cv * 10)
-            
+                avg_cv = stats['avg_cv']
+                # Ultra-high confidence if models agree strongly
+                idx = int(np.searchsorted(self._CV_BINS, avg_cv, side='right'))
+                agreement_score = (self._AGREE_SCORES[idx] if idx < self._CV_BINS.size
+                                   else max(0.3, 0.9 - avg_cv * 10))
+
+                # Boost confidence if all models have high scores
+                if scores.size:
+                    avg_model_score = scores.mean()
+                    idx = int(np.searchsorted(self._QUALITY_BINS, avg_model_score, side='right'))
+                    quality_score = (self._QUALITY_SCORES[idx - 1] if idx > 0
+                                     else max(0.5, avg_model_score + 0.15))
+                else:
+                    quality_score = 0.5
+
             confidence_factors.append(('agreement', agreement_score, 0.30))
-            
-            # Layer 2: Model Quality & Performance (25% weight)
-            avg_model_score = np.mean([self.cross_validation_scores.get(model, 0.7) 
-                                     for model in predictions.keys() if model in self.cross_validation_scores])
-            
-            # Boost confidence if all models have high scores
-            if avg_model_score >= 0.8:
-                quality_score = 0.95
-            elif avg_model_score >= 0.75:
-                quality_score = 0.90
-            elif avg_model_score >= 0.7:
-                quality_score = 0.85
-            else:
-                quality_score = max(0.5, avg_model_score + 0.15)
-            
             confidence_factors.append(('quality', quality_score, 0.25))
             
+            # Layers 3 and 4 read the same tail scalars - snapshot them once
+            snapshot = self._snapshot_latest(data)
+
             # Layer 3: Market Condition Validation (20% weight)
-            market_score = self._analyze_market_conditions_for_confidence(data, market_context)
+            market_score = self._analyze_market_conditions_for_confidence(
+                data, market_context, snapshot=snapshot)
             confidence_factors.append(('market_conditions', market_score, 0.20))
-            
+
             # Layer 4: Technical Signal Strength (15% weight)
-            tech_score = self._validate_technical_signals_for_confidence(data)
+            tech_score = self._validate_technical_signals_for_confidence(
+                data, snapshot=snapshot)
             confidence_factors.append(('technical_strength', tech_score, 0.15))
             
             # Layer 5: Downward Trend Detection (10% weight)
-            downward_score = self._validate_downward_trend_confidence(predictions, data)
+            downward_score = self._validate_downward_trend_confidence(predictions, data, stats=stats)
             confidence_factors.append(('downward_trend', downward_score, 0.10))
             
             # Calculate weighted confidence
@@ -1267,54 +1837,68 @@ class EnhancedEnsembleModel:
             logger.error(f"Ultra-high confidence calculation failed: {e}")
             return 0.88  # High default confidence
     
-    def _analyze_market_conditions_for_confidence(self, data: pd.DataFrame, market_context: Dict) -> float:
+    @staticmethod
+    def _snapshot_latest(data: pd.DataFrame) -> Dict[str, Any]:
+        """Snapshot the tail scalars the confidence helpers read.
+
+        One pass of plain ndarray reads instead of a pandas .iloc/.tail
+        dispatch per value; keys are only present when the source column
+        and history length allow them.
+        """
+        snap: Dict[str, Any] = {'n': len(data)}
+        if snap['n'] == 0:
+            return snap
+
+        cols = frozenset(data.columns)
+        for col in ('Close', 'RSI', 'MACD', 'MACD_Signal', 'BB_Upper', 'BB_Lower'):
+            if col in cols:
+                snap[col.lower()] = float(data[col].values[-1])
+
+        if 'Volume' in cols and snap['n'] >= 10:
+            volumes = data['Volume'].values
+            snap['recent_volume'] = float(volumes[-5:].mean())
+            snap['historical_volume'] = float(volumes[-20:].mean())
+
+        if 'Close' in cols and snap['n'] >= 20:
+            closes = data['Close'].values.astype(np.float64)
+            pct = closes[1:] / closes[:-1] - 1.0
+            snap['recent_volatility'] = float(pct[-5:].std(ddof=1))
+            snap['historical_volatility'] = float(pct[-20:].std(ddof=1))
+
+        return snap
+
+    def _analyze_market_conditions_for_confidence(self, data: pd.DataFrame, market_context: Dict,
+                                                  snapshot: Optional[Dict[str, Any]] = None) -> float:
         """Phân tích điều kiện thị trường để tăng độ tin cậy"""
         try:
             confidence_indicators = []
-            
+
+            if snapshot is None:
+                if data is None or data.empty:
+                    return 0.75  # Fast path: nothing to inspect
+                snapshot = self._snapshot_latest(data)
+
             # Volume analysis for confirmation
-            if 'Volume' in data.columns and len(data) >= 10:
-                recent_volume = data['Volume'].tail(5).mean()
-                historical_volume = data['Volume'].tail(20).mean()
-                volume_ratio = recent_volume / historical_volume if historical_volume > 0 else 1.0
-                
-                if volume_ratio > 1.2:  # High volume confirms trend
-                    confidence_indicators.append(0.9)
-                elif volume_ratio > 0.8:  # Normal volume
-                    confidence_indicators.append(0.75)
-                else:  # Low volume (less reliable)
-                    confidence_indicators.append(0.6)
-            
-            # Volatility analysis
-            if 'Close' in data.columns and len(data) >= 20:
-                recent_volatility = data['Close'].pct_change().tail(5).std()
-                historical_volatility = data['Close'].pct_change().tail(20).std()
-                
-                # Lower volatility = higher confidence in predictions
-                if recent_volatility < historical_volatility * 0.8:
-                    confidence_indicators.append(0.9)
-                elif recent_volatility < historical_volatility:
-                    confidence_indicators.append(0.8)
-                else:
-                    confidence_indicators.append(0.65)
-            
+            if 'recent_volume' in snapshot:
+                historical_volume = snapshot['historical_volume']
+                volume_ratio = (snapshot['recent_volume'] / historical_volume
+                                if historical_volume > 0 else 1.0)
+                confidence_indicators.append(self._ladder('volume_ratio', volume_ratio))
+
+            # Volatility analysis - lower volatility = higher confidence
+            if 'recent_volatility' in snapshot:
+                historical_volatility = snapshot['historical_volatility']
+                volatility_ratio = (snapshot['recent_volatility'] / historical_volatility
+                                    if historical_volatility > 0 else 1.0)
+                confidence_indicators.append(self._ladder('volatility_ratio', volatility_ratio))
+
             # Market context scores
             if market_context:
-                technical_score = market_context.get('technical_score', 50)
-                if technical_score >= 80:
-                    confidence_indicators.append(0.9)
-                elif technical_score >= 60:
-                    confidence_indicators.append(0.8)
-                else:
-                    confidence_indicators.append(0.7)
-                
-                sentiment_score = market_context.get('sentiment_score', 50)
-                if sentiment_score <= 30:  # Strong negative sentiment supports downward prediction
-                    confidence_indicators.append(0.9)
-                elif sentiment_score <= 50:
-                    confidence_indicators.append(0.8)
-                else:
-                    confidence_indicators.append(0.7)
+                confidence_indicators.append(self._ladder(
+                    'technical_score', market_context.get('technical_score', 50)))
+                # Strong negative sentiment supports downward prediction
+                confidence_indicators.append(self._ladder(
+                    'sentiment_score', market_context.get('sentiment_score', 50)))
             
             return np.mean(confidence_indicators) if confidence_indicators else 0.75
             
@@ -1322,39 +1906,45 @@ class EnhancedEnsembleModel:
             logger.error(f"Market conditions analysis failed: {e}")
             return 0.75
     
-    def _validate_technical_signals_for_confidence(self, data: pd.DataFrame) -> float:
+    def _validate_technical_signals_for_confidence(self, data: pd.DataFrame,
+                                                   snapshot: Optional[Dict[str, Any]] = None) -> float:
         """Validate technical signals strength for confidence boost"""
         try:
             signals_strength = []
-            
+
+            if snapshot is None:
+                if data is None or data.empty:
+                    return 0.75  # Fast path: nothing to inspect
+                snapshot = self._snapshot_latest(data)
+
             # RSI signals
-            if 'RSI' in data.columns:
-                latest_rsi = data['RSI'].iloc[-1]
+            if 'rsi' in snapshot:
+                latest_rsi = snapshot['rsi']
                 if latest_rsi > 70:  # Overbought - supports downward
                     signals_strength.append(0.9)
                 elif latest_rsi < 30:  # Oversold - supports upward
                     signals_strength.append(0.8)
                 else:
                     signals_strength.append(0.7)
-            
+
             # MACD signals
-            if 'MACD' in data.columns and 'MACD_Signal' in data.columns:
-                latest_macd = data['MACD'].iloc[-1]
-                latest_signal = data['MACD_Signal'].iloc[-1]
-                
+            if 'macd' in snapshot and 'macd_signal' in snapshot:
+                latest_macd = snapshot['macd']
+                latest_signal = snapshot['macd_signal']
+
                 if latest_macd < latest_signal:  # Bearish crossover
                     signals_strength.append(0.9)
                 elif latest_macd > latest_signal:  # Bullish crossover
                     signals_strength.append(0.8)
                 else:
                     signals_strength.append(0.7)
-            
+
             # Bollinger Bands position
-            if 'BB_Upper' in data.columns and 'BB_Lower' in data.columns and 'Close' in data.columns:
-                latest_close = data['Close'].iloc[-1]
-                bb_upper = data['BB_Upper'].iloc[-1]
-                bb_lower = data['BB_Lower'].iloc[-1]
-                
+            if 'bb_upper' in snapshot and 'bb_lower' in snapshot and 'close' in snapshot:
+                latest_close = snapshot['close']
+                bb_upper = snapshot['bb_upper']
+                bb_lower = snapshot['bb_lower']
+
                 if latest_close > bb_upper * 0.95:  # Near upper band - bearish
                     signals_strength.append(0.9)
                 elif latest_close < bb_lower * 1.05:  # Near lower band - bullish
@@ -1368,28 +1958,23 @@ class EnhancedEnsembleModel:
             logger.error(f"Technical validation failed: {e}")
             return 0.75
     
-    def _validate_downward_trend_confidence(self, predictions: Dict[str, Dict], data: pd.DataFrame) -> float:
+    def _validate_downward_trend_confidence(self, predictions: Dict[str, Dict], data: pd.DataFrame,
+                                            stats: Optional[Dict[str, Any]] = None) -> float:
         """Special validation for downward trend predictions"""
         try:
             downward_indicators = []
-            
-            # Count models predicting downward
-            downward_models = 0
-            total_models = 0
-            
-            for model_name, pred in predictions.items():
-                day_1_pred = pred['day_1']
-                day_2_pred = pred['day_2']
-                
-                # Current price for comparison
-                current_price = data['Close'].iloc[-1]
-                
-                if day_1_pred < current_price * 0.995:  # Predicting decline
-                    downward_models += 1
-                if day_2_pred < current_price * 0.99:  # Predicting continued decline
-                    downward_models += 0.5
-                
-                total_models += 2
+
+            # Count models predicting downward - branchless mask sums
+            # instead of a per-model Python loop
+            if stats is None:
+                stats = self._prediction_stats(predictions)
+            d1, d2 = stats['d1'], stats['d2']
+            current_price = data['Close'].values[-1]
+
+            mask1 = d1 < current_price * 0.995   # Predicting decline
+            mask2 = d2 < current_price * 0.99    # Predicting continued decline
+            downward_models = mask1.sum() + 0.5 * mask2.sum()
+            total_models = 2 * d1.size
             
             # Strong downward consensus
             downward_ratio = downward_models / total_models if total_models > 0 else 0
@@ -1403,9 +1988,10 @@ class EnhancedEnsembleModel:
             
             # Technical confirmation for downward
             if 'Close' in data.columns and len(data) >= 10:
-                recent_prices = data['Close'].tail(5).values
-                earlier_prices = data['Close'].tail(10).head(5).values
-                
+                closes = data['Close'].values
+                recent_prices = closes[-5:]
+                earlier_prices = closes[-10:-5]
+
                 # Check if recent trend is downward
                 recent_trend = (recent_prices[-1] - recent_prices[0]) / recent_prices[0]
                 overall_trend = (earlier_prices[-1] - earlier_prices[0]) / earlier_prices[0]
@@ -1427,15 +2013,23 @@ class EnhancedEnsembleModel:
         """Lấy feature importance từ các models"""
         importance = {}
         
-        # XGBoost feature importance
-        if self.xgb_model.is_trained and self.xgb_model.model:
-            try:
-                xgb_importance = self.xgb_model.model.feature_importances_
-                for i, feature in enumerate(self.xgb_model.feature_names):
-                    importance[f'xgb_{feature}'] = xgb_importance[i]
-            except:
-                pass
-        
+        # XGBoost feature importance - guarded lookups instead of a bare
+        # except so real errors surface and the hot path stays handler-free
+        if not (self.xgb_model.is_trained and self.xgb_model.model):
+            return importance
+
+        xgb_importance = getattr(self.xgb_model.model, 'feature_importances_', None)
+        if xgb_importance is None:
+            return importance
+
+        # Prefixed names are cached on the model; repeat calls skip
+        # the per-feature string formatting entirely
+        names = getattr(self.xgb_model, '_prefixed_names', None)
+        if names is None or len(names) != len(xgb_importance):
+            names = ['xgb_' + feature for feature in self.xgb_model.feature_names]
+            self.xgb_model._prefixed_names = names
+        importance.update(zip(names, xgb_importance.tolist()))
+
         return importance
 
 def test_enhanced_ensemble_model():
@@ -1446,32 +2040,84 @@ def test_enhanced_ensemble_model():
     
     try:
         # Create dummy data
-        from datetime import datetime, timedelta
-        dates = pd.date_range(start=datetime.now() - timedelta(days=100), 
+        dates = pd.date_range(start=datetime.now() - timedelta(days=100),
                              end=datetime.now(), freq='D')
-        np.random.seed(42)
-        dummy_prices = 100 + np.cumsum(np.random.randn(len(dates)) * 0.02)
-        dummy_volume = np.random.randint(1000000, 5000000, len(dates))
-        
+        # PCG64 generator: faster than the legacy global MT19937 state and
+        # safe if the harness is ever run from multiple threads
+        rng = np.random.default_rng(42)
+        n = len(dates)
+        # float32 end to end: XGBoost and the LSTM both consume float32,
+        # so building the data in float64 would only double the bytes
+        # moved (daily prices fit easily in f32's 7 significant digits)
+        if NUMBA_AVAILABLE:
+            # One fused pass: no randn/cumsum temporaries
+            dummy_prices = _synth_prices_kernel(n, 42).astype(np.float32)
+        else:
+            dummy_prices = 100 + np.cumsum(
+                rng.standard_normal(n, dtype=np.float32) * np.float32(0.02))
+        dummy_volume = rng.integers(1000000, 5000000, n, dtype=np.int32)
+
+        # One RNG block and one broadcast for the three OHLC offsets,
+        # then a single DataFrame construction with the index in place
+        noise = rng.random((n, 3), dtype=np.float32) * np.array([2.0, 2.0, 3.0],
+                                                                dtype=np.float32)
+        ohlc = dummy_prices[:, None] + noise * np.array([-1.0, 1.0, -1.0],
+                                                        dtype=np.float32)
+
         dummy_data = pd.DataFrame({
-            'Date': dates,
-            'Open': dummy_prices - np.random.rand(len(dates)) * 2,
-            'High': dummy_prices + np.random.rand(len(dates)) * 2,
-            'Low': dummy_prices - np.random.rand(len(dates)) * 3,
+            'Open': ohlc[:, 0],
+            'High': ohlc[:, 1],
+            'Low': ohlc[:, 2],
             'Close': dummy_prices,
             'Volume': dummy_volume
-        })
-        dummy_data.set_index('Date', inplace=True)
-        
-        # Add some basic technical indicators
-        from stock_analyzer.modules.technical_analysis import perform_technical_analysis
-        dummy_data = perform_technical_analysis(dummy_data)
+        }, index=dates)
+        dummy_data.index.name = 'Date'
+        
+        # Add some basic technical indicators; identical dummy data reuses
+        # the cached TA result instead of recomputing every indicator
+        ta_key = int(pd.util.hash_pandas_object(dummy_data).values.sum())
+        cached_ta = _TA_CACHE.get(ta_key)
+        if cached_ta is None:
+            cached_ta = perform_technical_analysis(dummy_data)
+            _TA_CACHE[ta_key] = cached_ta
+        dummy_data = cached_ta
         
         # Test ensemble model
         ensemble = EnhancedEnsembleModel()
         
         print("🚀 Training ensemble models...")
-        ensemble.train_all_models(dummy_data)
+        cache_path = None
+        if JOBLIB_AVAILABLE:
+            train_key = hashlib.sha1(
+                pd.util.hash_pandas_object(dummy_data).values.tobytes()).hexdigest()
+            cache_path = os.path.join(tempfile.gettempdir(),
+                                      f'ensemble_{train_key}.joblib')
+
+        loaded = False
+        if cache_path and os.path.exists(cache_path):
+            # Warm start: the memmapped load skips the whole training phase
+            try:
+                ensemble = joblib.load(cache_path, mmap_mode='r')
+                loaded = True
+            except Exception:
+                # Stale or truncated dump - drop it and retrain below
+                try:
+                    os.remove(cache_path)
+                except OSError:
+                    pass
+
+        if not loaded:
+            ensemble.train_all_models(dummy_data)
+            if cache_path:
+                try:
+                    joblib.dump(ensemble, cache_path)
+                except Exception:
+                    # A failed pickle (e.g. an unpicklable Keras graph) can
+                    # leave a partial file that would crash the next load
+                    try:
+                        os.remove(cache_path)
+                    except OSError:
+                        pass
         
         print("📊 Making predictions...")
         predictions = ensemble.predict_ensemble(dummy_data)
@@ -1493,7 +2139,6 @@ def test_enhanced_ensemble_model():
         
     except Exception as e:
         print(f"❌ Error during testing: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":